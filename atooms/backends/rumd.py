@@ -106,8 +106,11 @@ class RUMD(object):
                 itg = rumd.IntegratorNVE(timeStep=dt)
             self.rumd_simulation.SetIntegrator(itg)
 
-        # Copy of initial state
-        self._initial_sample = self.rumd_simulation.sample.Copy()
+        # Initial state for the rmsd baseline. We only keep the
+        # positions and periodic images, copying the whole sample just
+        # for this is wasteful.
+        self._initial_positions = numpy.array(self.rumd_simulation.sample.GetPositions())
+        self._initial_images = numpy.array(self.rumd_simulation.sample.GetImages())
 
         # Hold a reference to the system
         # self.system = System(self.rumd_simulation.sample, self.rumd_simulation.potentialList)
@@ -155,15 +158,13 @@ class RUMD(object):
         Compute the mean square displacement between actual sample and the
         reference sample.
         """
-        if self.rumd_simulation.sample is self._initial_sample:
-            raise Exception('rmsd between two references of the same system does not make sense (use deepecopy?)')
         ndim = 3  # hard coded
         N = self.rumd_simulation.sample.GetNumberOfParticles()
         L = [self.rumd_simulation.sample.GetSimulationBox().GetLength(i) for i in range(ndim)]
         # Unfold positions using periodic image information
-        ref = self._initial_sample.GetPositions() + self._initial_sample.GetImages() * L
+        ref = self._initial_positions + self._initial_images * L
         unf = self.rumd_simulation.sample.GetPositions() + self.rumd_simulation.sample.GetImages() * L
-        return (sum(sum((unf - ref)**2)) / N)**0.5
+        return (numpy.sum((unf - ref)**2) / N)**0.5
 
     def write_checkpoint(self, output_path):
         with Trajectory(output_path + '.chk', 'w') as t:
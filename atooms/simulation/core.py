@@ -98,6 +98,11 @@ class Simulation(object):
 
         # Internal variables
         self._observer = []
+        self._observer_view = []
+        self._observer_next = None
+        self._targeters = []
+        self._non_targeters = []
+        self._speedometers = []
         self._observer_id = 0
         self._start_time = time.time()
         self._speedometer = None
@@ -170,6 +175,7 @@ class Simulation(object):
             self._observer.insert(0, pack)
         else:
             self._observer.append(pack)
+        self._update_observers()
         return self._observer_id
 
     def remove(self, callback):
@@ -187,40 +193,51 @@ class Simulation(object):
                 # This will remove all instances
                 if cbk['callback'] == callback:
                     self._observer.remove(cbk)
+        self._update_observers()
 
     def remove_callback(self, callback):
         self.remove(callback)
 
+    def _update_observers(self):
+        """
+        Rebuild the flat view of the observers.
+
+        The view is a list of (callback, scheduler, args, kwargs)
+        tuples in the same order as `_observer`. The targeters,
+        non-targeters and speedometers partitions are cached along
+        with it. They are all rebuilt only when observers are added
+        or removed, so that `run()` does not have to rescan the
+        observers at every notification round.
+        """
+        self._observer_view = [(o['callback'], o['scheduler'], o['args'], o['kwargs'])
+                               for o in self._observer]
+        # Invalidate the cached next steps of the schedulers
+        self._observer_next = None
+        self._targeters = [o for o in self._observer_view if 'target' in _callable_name(o[0])]
+        self._non_targeters = [o for o in self._observer_view if 'target' not in _callable_name(o[0])]
+        self._speedometers = [o for o in self._observer_view if isinstance(o[0], Speedometer)]
+
     def _notify(self, observers):
-        for observer in observers:
-            _log.debug('notify %s at step %d', observer, self.current_step)
-            callback = observer['callback']
-            args = observer['args']
-            kwargs = observer['kwargs']
+        debug = _log.isEnabledFor(logging.DEBUG)
+        for callback, _, args, kwargs in observers:
+            if debug:
+                _log.debug('notify %s at step %d', callback, self.current_step)
             callback(self, *args, **kwargs)
 
-    @property
-    def _targeters(self):
-        return [o for o in self._observer if 'target' in _callable_name(o['callback'])]
-
-    @property
-    def _non_targeters(self):
-        return [o for o in self._observer if 'target' not in _callable_name(o['callback'])]
-
-    @property
-    def _speedometers(self):
-        return [o for o in self._observer if isinstance(o['callback'], Speedometer)]
-
     def write_checkpoint(self):
         """Write checkpoint to allow restarting a simulation."""
         if self.output_path is None:
             return
 
-        # We clear the checkpoint first.
-        # This way, if we get to write the step at the end of this function
+        # We clear the checkpoint step file first.
+        # This way, if we get to publish the step at the end of this function
         # we are sure the checkpoint is consistent
-        from atooms.core.utils import rmf
-        rmf(self.output_path + '.chk.step')
+        step_file = self.output_path + '.chk.step'
+        try:
+            os.remove(step_file)
+        except OSError:
+            # File does not exist
+            pass
 
         if hasattr(self.backend, 'write_checkpoint'):
             # Use native backend checkpoint method
@@ -233,9 +250,12 @@ class Simulation(object):
                 t.precision = 12
                 t.write(self.system)
 
-        # Checkpoint number of steps
-        with open(self.output_path + '.chk.step', 'w') as fh:
+        # Checkpoint number of steps. We write the file aside and
+        # publish it with a single atomic rename, so it appears only
+        # once fully written.
+        with open(step_file + '.tmp', 'w') as fh:
             fh.write('%d' % self.current_step)
+        os.rename(step_file + '.tmp', step_file)
 
 
     def read_checkpoint(self):
@@ -334,7 +354,7 @@ class Simulation(object):
             # Add a dummy callback to trigger update of progress bar
             # when observers have a long interval. We try to flush the
             # progress bar 10 times.
-            intervals = [cbk['scheduler'].interval for cbk in self._observer]
+            intervals = [scheduler.interval for _, scheduler, _, _ in self._observer_view]
             intervals = [interval for interval in intervals if interval is not None]
             min_iters = 10
             if len(intervals) == 0 or (min(intervals) > (self.current_step + self.steps) / min_iters and
@@ -366,9 +386,8 @@ class Simulation(object):
 
         # Reinitialize speedometers
         for s in self._speedometers:
-            s['callback']._init = False
-        from atooms.core.progress import progress
-        bar = progress(total=self.steps)
+            s[0]._init = False
+        bar = atooms.core.progress.progress(total=self.steps)
 
         try:
             # Before entering the simulation, check if we can quit right away
@@ -383,22 +402,44 @@ class Simulation(object):
                 self._notify(self._non_targeters)
 
             while True:
-                # Run simulation until any of the observers need to be called
-                # TODO: change naming
-                all_steps = [c['scheduler'](self) for c in self._observer]
+                # Run simulation until any of the observers need to be called.
+                # The next step of each scheduler is cached and recomputed
+                # below only for the observers that actually fired: for
+                # observers that did not fire, the cached step is still in
+                # the future and hence still valid.
+                view = self._observer_view
+                if self._observer_next is None:
+                    self._observer_next = [observer[1](self) for observer in view]
+                next_steps = self._observer_next
+
+                # Find the minimum next step and the observers that fire
+                # at it in a single pass
                 next_checkpoint = self._checkpoint_scheduler(self)
-                next_step = min(all_steps + [next_checkpoint])
+                next_step = next_checkpoint
+                next_observers = []
+                next_ids = []
+                for i, step in enumerate(next_steps):
+                    if step < next_step:
+                        next_step = step
+                        next_observers = [view[i]]
+                        next_ids = [i]
+                    elif step == next_step:
+                        next_observers.append(view[i])
+                        next_ids.append(i)
 
                 self.run_until(next_step)
 
-                # Find observers indexes corresponding to minimum step
-                # then get all corresponding observers
-                next_step_ids = [i for i, step in enumerate(all_steps) if step == next_step]
-                next_observers = [self._observer[i] for i in next_step_ids]
-
                 # Observers should be sorted such that targeters are
                 # last to avoid cropping output files
                 self._notify(next_observers)
+
+                # Refresh the cached steps of the observers that fired,
+                # unless a callback changed the observers and the cache
+                # was invalidated during notification
+                if self._observer_next is next_steps:
+                    for i in next_ids:
+                        next_steps[i] = view[i][1](self)
+
                 if self.current_step == next_checkpoint:
                     self.write_checkpoint()
 
@@ -446,25 +487,27 @@ class Simulation(object):
     def _info_observers(self):
         txt = []
         for observer in self._observer:
-            callback = observer['callback']
+            name = _callable_name(observer['callback'])
             scheduler = observer['scheduler']
-            if 'target' in _callable_name(callback):
+            if 'target' in name:
                 args = observer['args']
-                txt.append('target %s: %s' % (_callable_name(callback), args[0]))
+                txt.append('target %s: %s' % (name, args[0]))
             else:
                 txt.append('writer %s: interval=%s calls=%s' %
-                           (_callable_name(callback), scheduler.interval, scheduler.calls))
+                           (name, scheduler.interval, scheduler.calls))
         return '\n'.join(txt) + '\n'
 
     def _info_end(self):
         now = datetime.datetime.now().strftime('%Y-%m-%d at %H:%M')
+        # Take the wall time stamp once for both entries
+        wtime = self.wall_time()
+        wtime_per_step_particle = self.wall_time(per_step=True, per_particle=True)
         txt = """
         final steps: {}
         final rmsd: {:.2f}
         wall time [s]: {:.2f}
         average TSP [s/step/particle]: {:.2e}
         simulation ended on: {}\
-        """.format(self.current_step, self.rmsd, self.wall_time(),
-                   self.wall_time(per_step=True, per_particle=True),
-                   now)
+        """.format(self.current_step, self.rmsd, wtime,
+                   wtime_per_step_particle, now)
         return txt
@@ -113,43 +113,59 @@ class Scheduler(object):
         if self.calls is not None and self.calls <= 0:
             self.calls = None
 
+        # Bind the scheduling strategy once, so that __call__ does not
+        # have to go through the cascade of argument checks each time
+        if self.interval is not None and self.calls is None:
+            self._next = self._next_interval
+        elif self.calls is not None:
+            self._next = self._next_calls
+        elif self.steps is not None:
+            self._next = self._next_steps
+        elif self.block is not None:
+            self._next = self._next_block
+        elif self.seconds is not None:
+            self._next = self._next_seconds
+        else:
+            self._next = self._next_none
+
     def __call__(self, sim):
         """
         Given a simulation instance `sim`, return the next step at which
         the observer will be called.
         """
-        if self.interval is not None and self.calls is None:
-            # Regular interval
-            return (sim.current_step // self.interval + 1) * self.interval
+        return self._next(sim)
 
-        elif self.calls is not None:
-            # Fixed number of calls
-            interval = max(1, sim.steps // self.calls)
-            return (sim.current_step // interval + 1) * interval
+    def _next_interval(self, sim):
+        # Regular interval
+        return (sim.current_step // self.interval + 1) * self.interval
 
-        elif self.steps is not None:
-            # List of selected steps
-            inext = sys.maxsize
-            for i, step in enumerate(self.steps):
-                if step > sim.current_step:
-                    inext = self.steps[i]
-                    break
-            return inext
+    def _next_calls(self, sim):
+        # Fixed number of calls
+        interval = max(1, sim.steps // self.calls)
+        return (sim.current_step // interval + 1) * interval
 
-        elif self.block is not None:
-            # Periodic block of steps
-            step_of_last_block = (sim.current_step // self.block[-1]) * self.block[-1]
-            inext = sys.maxsize
-            for i, step in enumerate(self.block):
-                if step > sim.current_step % self.block[-1]:
-                    inext = self.block[i] + step_of_last_block
-                    break
-            return inext
+    def _next_steps(self, sim):
+        # List of selected steps
+        for step in self.steps:
+            if step > sim.current_step:
+                return step
+        return sys.maxsize
 
-        elif self.seconds is not None:
-            pass
-        else:
-            return sys.maxsize
+    def _next_block(self, sim):
+        # Periodic block of steps
+        period = self.block[-1]
+        step_of_last_block = (sim.current_step // period) * period
+        step_in_block = sim.current_step % period
+        for step in self.block:
+            if step > step_in_block:
+                return step + step_of_last_block
+        return sys.maxsize
+
+    def _next_seconds(self, sim):
+        pass
+
+    def _next_none(self, sim):
+        return sys.maxsize
 
 
 # Writer callbacks
@@ -423,8 +439,9 @@ def target(sim, attribute, value):
     """
     x = float(getattr(sim, attribute))
     if value > 0:
-        frac = float(x) / value
-        _log.debug('target {} now at {} [{:d}]'.format(attribute, x, int(frac * 100)))
+        frac = x / value
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug('target {} now at {} [{:d}]'.format(attribute, x, int(frac * 100)))
     if x >= value:
         raise SimulationEnd('reached target {}: {}'.format(attribute, value))
     return frac
@@ -448,10 +465,10 @@ def target_walltime(sim, value):
     limits.
     """
     wtime_limit = value
-    if sim.wall_time() > wtime_limit:
+    t = sim.wall_time()
+    if t > wtime_limit:
         raise SimulationEnd('target wall time reached')
     else:
-        t = sim.wall_time()
         dt = wtime_limit - t
         _log.debug('elapsed time %g, reamining time %g', t, dt)
 
@@ -511,6 +528,10 @@ def shell_stop(sim, cmd, exit_code=1):
             _log.error('shell command {} failed with output {}'.format(cmd, e.output))
             raise
 
+# Cache of the STOP file path for each output path, so that user_stop
+# does not redo the isdir/dirname dance at every call
+_user_stop_file = {}
+
 def user_stop(sim):
     """
     Allows a user to stop the simulation smoothly by touching a STOP
@@ -520,11 +541,16 @@ def user_stop(sim):
     # To make it work in parallel we should broadcast and then rm
     # or subclass userstop in classes that use parallel execution
     if sim.output_path is not None:
-        if os.path.isdir(sim.output_path):
-            dirpath = sim.output_path
-        else:
-            dirpath = os.path.dirname(sim.output_path)
-        if os.path.exists('%s/STOP' % dirpath):
+        try:
+            stop_file = _user_stop_file[sim.output_path]
+        except KeyError:
+            if os.path.isdir(sim.output_path):
+                dirpath = sim.output_path
+            else:
+                dirpath = os.path.dirname(sim.output_path)
+            stop_file = os.path.join(dirpath, 'STOP')
+            _user_stop_file[sim.output_path] = stop_file
+        if os.path.exists(stop_file):
             raise SimulationEnd('user has stopped the simulation')
 
 # Aliases
@@ -548,23 +574,18 @@ class Speedometer(object):
         if not self._init:
             # We could store all this in __init__() but this
             # way we allow targeters added to simulation via add()
-            for observer in sim._observer:
-                c = observer['callback']
-                if c is self:
+            for callback, _, args, kwargs in sim._targeters:
+                if callback is self:
                     continue
-                if 'target' in c.__name__.lower():
-                    self._observer = observer
-                    args = observer['args']
-                    kwargs = observer['kwargs']
-                    self.x_last = c(sim, *args, **kwargs)
-                    self.t_last = time.time()
-                    self._init = True
-                    return
+                self._target = (callback, args, kwargs)
+                self.x_last = callback(sim, *args, **kwargs)
+                self.t_last = time.time()
+                self._init = True
+                return
 
         t_now = time.time()
-        args = self._observer['args']
-        kwargs = self._observer['kwargs']
-        x_now = self._observer['callback'](sim, *args, **kwargs)
+        callback, args, kwargs = self._target
+        x_now = callback(sim, *args, **kwargs)
         # Get the speed at which the simulation advances
         speed = (x_now - self.x_last) / (t_now - self.t_last)
         # Report fraction of target achieved and ETA
@@ -574,12 +595,18 @@ class Speedometer(object):
             d_now = datetime.datetime.now()
             d_delta = datetime.timedelta(seconds=eta)
             d_eta = d_now + d_delta
+            # Compute the wall time once and derive both normalizations
+            wtime_per_step = sim.wall_time(per_step=True)
+            if len(sim.system.particle) > 0:
+                wtime_per_step_particle = wtime_per_step / len(sim.system.particle)
+            else:
+                wtime_per_step_particle = float('nan')
             # self._callback.__name__,
             _log.info('%2d%% ETA: %s S/T: %.1f T/SP: %.2e',
                       int(frac * 100),
                       d_eta.strftime('%Y-%m-%d %H.%M'),
-                      1./sim.wall_time(per_step=True),
-                      sim.wall_time(per_step=True, per_particle=True))
+                      1./wtime_per_step,
+                      wtime_per_step_particle)
         except ZeroDivisionError:
             print(x_now, self.x_last)
             raise
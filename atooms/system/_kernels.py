@@ -0,0 +1,158 @@
+# This file is part of atooms
+# Copyright 2010-2017, Daniele Coslovich
+
+"""
+Private kernels operating on raw (N, ndim) arrays.
+
+The pair kernels apply minimum-image periodic boundary conditions
+when a `box` array is given. They are jit-compiled with numba when it
+is available and fall back to vectorized numpy implementations
+otherwise.
+"""
+
+import numpy
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# Numpy implementations (also the fallback when numba is missing)
+
+def _sum_square_distances_numpy(pos, box, tile=512):
+    # Tile the first dimension to cap the memory of the broadcast
+    # difference array at tile * N * ndim floats
+    acc = 0.0
+    for i0 in range(0, pos.shape[0], tile):
+        dr = pos[i0:i0 + tile, None, :] - pos[None, :, :]
+        if box is not None:
+            dr -= numpy.rint(dr / box) * box
+        acc += numpy.sum(dr**2)
+    return acc
+
+
+def _overlap_pairs_numpy(pos, radii, box):
+    dr = pos[:, None, :] - pos[None, :, :]
+    if box is not None:
+        dr -= numpy.rint(dr / box) * box
+    dsq = numpy.sum(dr**2, axis=2)
+    cut = radii[:, None] + radii[None, :]
+    found = numpy.triu(dsq < cut**2, k=1)
+    ii, jj = numpy.nonzero(found)
+    return list(zip(ii.tolist(), jj.tolist()))
+
+
+if HAS_NUMBA:
+
+    @numba.njit(cache=True)
+    def _sum_square_distances_njit(pos, box):
+        npart, ndim = pos.shape
+        acc = 0.0
+        for i in range(npart):
+            for j in range(i + 1, npart):
+                for k in range(ndim):
+                    dx = pos[i, k] - pos[j, k]
+                    dx -= box[k] * round(dx / box[k])
+                    acc += dx * dx
+        # Sum over ordered pairs
+        return 2 * acc
+
+    @numba.njit(cache=True)
+    def _overlap_pairs_njit(pos, radii, box, iout, jout):
+        npart, ndim = pos.shape
+        n = 0
+        for i in range(npart):
+            for j in range(i + 1, npart):
+                dsq = 0.0
+                for k in range(ndim):
+                    dx = pos[i, k] - pos[j, k]
+                    dx -= box[k] * round(dx / box[k])
+                    dsq += dx * dx
+                cut = radii[i] + radii[j]
+                if dsq < cut**2:
+                    iout[n] = i
+                    jout[n] = j
+                    n += 1
+        return n
+
+
+def _overlap_pairs_cell_list(pos, radii, box):
+    """
+    Cell-list version of the overlap search: bin the positions on a
+    grid of cells no smaller than the largest particle diameter, then
+    compare each particle only against the particles in its
+    neighboring cells. Complexity drops from O(N^2) to O(N).
+    """
+    from itertools import product
+
+    box = numpy.asarray(box, dtype=float)
+    cutoff = 2 * numpy.max(radii)
+    if cutoff <= 0:
+        return []
+    ncells = numpy.maximum((box / cutoff).astype(int), 1)
+
+    # Fold positions into [0, box) and assign cell indices
+    folded = pos - numpy.floor(pos / box) * box
+    index = numpy.minimum((folded * (ncells / box)).astype(int), ncells - 1)
+    cells = {}
+    for i, idx in enumerate(map(tuple, index)):
+        cells.setdefault(idx, []).append(i)
+
+    shifts = list(product((-1, 0, 1), repeat=len(box)))
+    pairs = set()
+    for idx, members in cells.items():
+        # Collect the particles in the cell and its neighbors,
+        # wrapping around the periodic boundaries
+        neighborhood = set()
+        for shift in shifts:
+            jdx = tuple((numpy.add(idx, shift)) % ncells)
+            if jdx in cells:
+                neighborhood.update(cells[jdx])
+        members = numpy.array(members)
+        neighborhood = numpy.array(sorted(neighborhood))
+        dr = pos[members][:, None, :] - pos[neighborhood][None, :, :]
+        dr -= numpy.rint(dr / box) * box
+        dsq = numpy.sum(dr**2, axis=2)
+        cut = radii[members][:, None] + radii[neighborhood][None, :]
+        for i, j in zip(*numpy.nonzero(dsq < cut**2)):
+            i, j = int(members[i]), int(neighborhood[j])
+            if i < j:
+                pairs.add((i, j))
+    return sorted(pairs)
+
+
+# Below this number of particles the all-pairs overlap search is
+# faster than setting up a cell list
+_CELL_LIST_MIN_NPART = 200
+
+
+# Public interface of the module
+
+def sum_square_distances(pos, box=None):
+    """
+    Sum of squared distances over all ordered pairs of positions in
+    `pos`, using minimum-image convention if `box` is given.
+    """
+    if HAS_NUMBA and box is not None:
+        return _sum_square_distances_njit(pos, numpy.asarray(box))
+    return _sum_square_distances_numpy(pos, box)
+
+
+def overlap_pairs(pos, radii, box=None):
+    """
+    Return the list of (i, j) pairs of positions in `pos`, with i < j,
+    whose distance is smaller than the sum of their radii.
+    """
+    if box is not None and pos.shape[0] >= _CELL_LIST_MIN_NPART:
+        return _overlap_pairs_cell_list(pos, radii, box)
+    if HAS_NUMBA and box is not None:
+        # At most N*(N-1)/2 pairs can overlap, but we never expect
+        # more than of the order of N of them
+        npart = pos.shape[0]
+        iout = numpy.empty(npart * (npart - 1) // 2, dtype=numpy.int64)
+        jout = numpy.empty_like(iout)
+        n = _overlap_pairs_njit(pos, radii, numpy.asarray(box), iout, jout)
+        return list(zip(iout[:n].tolist(), jout[:n].tolist()))
+    return _overlap_pairs_numpy(pos, radii, box)
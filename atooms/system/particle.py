@@ -4,6 +4,7 @@
 """Point particles in a cartesian reference frame."""
 
 import logging
+import math
 import numpy
 import random
 from copy import deepcopy
@@ -34,6 +35,20 @@ class Particle(object):
         """Particle diameter."""
         return self.radius * 2
 
+    def _clone(self):
+        """
+        Return a copy of the particle, much faster than deepcopy.
+
+        Only the position and velocity arrays are actually copied,
+        other attributes share their references with the original
+        particle.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.position = self.position.copy()
+        new.velocity = self.velocity.copy()
+        return new
+
     def nearest_image(self, particle, cell, copy=False, folded=False):
         """
         Return the nearest image of `particle` in the given `cell`.
@@ -53,7 +68,7 @@ class Particle(object):
         else:
             rij = _periodic_vector_unfolded(rij, cell.side)
         if copy:
-            image = deepcopy(self)
+            image = self._clone()
             image.position = particle.position + rij
             return image
         else:
@@ -103,8 +118,10 @@ class Particle(object):
         Assign the velocity to particle according to a Maxwell-Boltzmann
         distribution at temperature `T`.
         """
+        # The width of the distribution is the same for all components
+        sigma = math.sqrt(T / self.mass)
         for i in range(len(self.velocity)):
-            self.velocity[i] = random.gauss(0, numpy.sqrt(T / self.mass))
+            self.velocity[i] = random.gauss(0, sigma)
 
     @property
     def kinetic_energy(self):
@@ -116,20 +133,25 @@ class Particle(object):
 
 def _periodic_vector(vec, box):
     # TODO: what about particle distances precisely equal to L/2 or -L/2?
-    for i in range(vec.shape[0]):
-        if vec[i] > box[i] / 2:
-            vec[i] += - box[i]
-        elif vec[i] < -box[i] / 2:
-            vec[i] += box[i]
-    # Compact version
-    # return numpy.where(abs(a) > box/2, a-numpy.copysign(box, a), a)
+    # Branchless form: the mask multiply applies the shift only where
+    # needed, without a data-dependent select, and updates in place
+    vec -= numpy.copysign(box, vec) * (numpy.abs(vec) > 0.5 * box)
     return vec
 
 
-def _periodic_vector_unfolded(vec, box):
-    return vec - numpy.rint(vec / box) * box
-    # Optimized version
-    # return vec - numpy.rint(vec * invbox) * box
+def _periodic_vector_unfolded(vec, box, inv_box=None):
+    # Run the whole ufunc chain through a single work buffer instead
+    # of allocating an intermediate array per operation. Callers in
+    # tight loops can pass a precomputed inverse box to replace the
+    # division with a multiplication.
+    if inv_box is None:
+        tmp = numpy.divide(vec, box)
+    else:
+        tmp = numpy.multiply(vec, inv_box)
+    numpy.rint(tmp, out=tmp)
+    numpy.multiply(tmp, box, out=tmp)
+    numpy.subtract(vec, tmp, out=tmp)
+    return tmp
 
 
 def _periodic_vector_delta_unfolded(vec, box):
@@ -142,6 +164,27 @@ def _periodic_vector_delta_unfolded(vec, box):
     return numpy.rint(vec / box) * box
 
 
+def maxwellian(particles, T):
+    """
+    Assign velocities to a list of `particles` according to a
+    Maxwell-Boltzmann distribution at temperature `T`.
+
+    The normal variates for all particles are drawn in a single
+    batched call, which is much faster than drawing them one particle
+    at a time.
+    """
+    if len(particles) == 0:
+        return particles
+    sigma = numpy.sqrt(T / numpy.array([p.mass for p in particles]))
+    ndim = len(particles[0].velocity)
+    vel = numpy.random.normal(size=(len(particles), ndim)) * sigma[:, None]
+    # Assignments stay in place so that views on the velocities, such
+    # as the ones returned by System.dump(), remain in sync
+    for p, v in zip(particles, vel):
+        p.velocity[...] = v
+    return particles
+
+
 def fix_total_momentum(particles):
     """
     Subtract out the center of mass velocity from a list of
@@ -157,22 +200,16 @@ def cm_velocity(particle):
     """Velocity of the center of mass of a list of particles."""
     if len(particle) == 0:
         return 0.0
-    vcm = numpy.zeros_like(particle[0].velocity)
-    mtot = 0.0
-    for p in particle:
-        vcm += p.velocity * p.mass
-        mtot += p.mass
-    return vcm / mtot
+    vel = numpy.array([p.velocity for p in particle])
+    mass = numpy.array([p.mass for p in particle])
+    return numpy.dot(mass, vel) / numpy.sum(mass)
 
 
 def cm_position(particle):
     """Center-of-mass of a list of particles."""
-    rcm = numpy.zeros_like(particle[0].position)
-    mtot = 0.0
-    for p in particle:
-        rcm += p.position * p.mass
-        mtot += p.mass
-    return rcm / mtot
+    pos = numpy.array([p.position for p in particle])
+    mass = numpy.array([p.mass for p in particle])
+    return numpy.dot(mass, pos) / numpy.sum(mass)
 
 
 def distinct_species(particles):
@@ -188,14 +225,11 @@ def composition(particles):
     Return a dictionary containing the number of particles of each
     species appearing the input `particles` list.
     """
-    from collections import defaultdict
-    comp = defaultdict(int)
-    for p in particles:
-        try:
-            comp[p.species] += 1
-        except TypeError:
-            comp[int(p.species)] += 1
-    return comp
+    from collections import Counter
+    try:
+        return Counter(p.species for p in particles)
+    except TypeError:
+        return Counter(int(p.species) for p in particles)
 
 
 def rotate(particle, cell):
@@ -232,21 +266,22 @@ def rotate(particle, cell):
     pr_axis = p[0].position - p[imax].position
     ro_axis = numpy.cross(pr_axis, z_axis)
     theta = math.acos(numpy.dot(pr_axis, z_axis) / (norm2(pr_axis) * norm2(z_axis))**0.5)
-    for pi in p:
-        pi.position = numpy.dot(rotation(ro_axis, theta), pi.position)
+    # Compute the rotation matrix once and rotate all the positions
+    # with a single matrix product
+    pos = numpy.dot(numpy.array([pi.position for pi in p]),
+                    rotation(ro_axis, theta).transpose())
+    for i, pi in enumerate(p):
+        pi.position = pos[i]
     return p
 
 
 def overlaps(particle, cell):
     """Check presence of overlaps between particles."""
-    x = []
-    for i, pi in enumerate(particle):
-        for j, pj in enumerate(particle):
-            if j <= i:
-                continue
-            d = sum(pi.distance(pj, cell)**2)**0.5
-            if d < (pi.radius + pj.radius):
-                x.append((i, j))
+    from ._kernels import overlap_pairs
+    pos = numpy.array([p.position for p in particle])
+    radii = numpy.array([p.radius for p in particle])
+    box = cell.side if cell is not None else None
+    x = overlap_pairs(pos, radii, box)
     return len(x) > 0, x
 
 
@@ -268,13 +303,10 @@ def gyration_radius(particles, cell=None, weight=None, center=None,
 
     # Order N^2 calculation
     if method == 'N2':
-        rg = 0.0
-        for pi in particles:
-            for pj in particles:
-                if pi is pj:
-                    continue
-                dr = pi.distance(pj, cell)
-                rg += numpy.dot(dr, dr)
+        from ._kernels import sum_square_distances
+        pos = numpy.array([p.position for p in particles])
+        box = cell.side if cell is not None else None
+        rg = sum_square_distances(pos, box)
         return (rg / (2*len(particles)**2))**0.5
 
     # Order N^1 calculation
@@ -291,30 +323,21 @@ def gyration_radius(particles, cell=None, weight=None, center=None,
             if center is None:
                 center = weight.argmax()
 
-        # Unfold cluster across pbc
-        p_central = particles[center]
-        if cell is None:
-            cluster = particles
-        else:
-            cluster = []
-            for p in particles:
-                cluster.append(p.nearest_image(p_central, cell, copy=True))
-
-        def weighted_cm_position(particle, weight):
-            """Weighted center-of-mass of a list of particles."""
-            rcm = numpy.zeros_like(particle[0].position)
-            wtot = sum(weight)
-            for i, p in enumerate(particle):
-                rcm += p.position * weight[i]
-            return rcm / wtot
-
-        # Compute gyration radius
-        rcm = weighted_cm_position(cluster, weight)
-        rg = 0.0
-        for i, p in enumerate(cluster):
-            dr = p.position - rcm
-            rg += numpy.dot(dr, dr) * weight[i]
-        rg /= len(cluster)
+        # Unfold cluster across pbc with respect to the central
+        # particle, directly on the stacked positions array: no
+        # particle copies are needed since only positions matter here
+        pos = numpy.array([p.position for p in particles])
+        if cell is not None:
+            p_central = particles[center]
+            rij = pos - p_central.position
+            rij -= numpy.rint(rij / cell.side) * cell.side
+            pos = p_central.position + rij
+
+        # Compute gyration radius on the stacked positions array:
+        # one vectorized pass instead of two Python loops over particles
+        rcm = numpy.sum(pos * weight[:, None], axis=0) / numpy.sum(weight)
+        dr = pos - rcm
+        rg = numpy.sum(numpy.sum(dr**2, axis=1) * weight) / len(particles)
         return rg**0.5
 
     # Minimize over possible centers
@@ -337,12 +360,13 @@ def collective_overlap(particle, other, a, side, normalize=True):
     # quantities in pure python takes forever.
     x = numpy.array([p.position for p in particle])
     y = numpy.array([p.position for p in other])
-    dr = numpy.ndarray(x.shape[0])
-    rij = numpy.asarray(y)
+    # Hoist the inverse of the box side out of the loop: multiplying
+    # is faster than dividing per frame
+    inv_side = 1.0 / numpy.asarray(side)
     q = 0
     for i in range(y.shape[0]):
         dr = x[:, :] - y[i, :]
-        dr = dr - numpy.rint(dr / side) * side
+        dr = dr - numpy.rint(dr * inv_side) * side
         dr = numpy.sum(dr**2, axis=1)
         q += (dr < a**2).sum()
     if normalize:
@@ -409,13 +433,14 @@ def _lattice(N, d=3):
         if n**d >= N:
             break
 
-    # Put particles on a cubic lattice
+    # Put particles on a cubic lattice. The positions are computed in
+    # bulk and shared as views on one contiguous array, instead of
+    # allocating a small array per site.
     a = 1.0 / n
-    particle = []
     from itertools import product
-    for site in product(range(n), repeat=d):
-        r = a * numpy.array(site) + a/2 - 0.5
-        particle.append(Particle(position=r))
+    sites = numpy.array(list(product(range(n), repeat=d)))
+    pos = a * sites + a/2 - 0.5
+    particle = [Particle(position=pos[i]) for i in range(len(pos))]
 
     # Etch particles from the crystal to match the target N
     particle = random.sample(particle, N)
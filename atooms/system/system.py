@@ -116,10 +116,8 @@ class System(object):
     @property
     def distinct_species(self):
         """Sorted list of distinct chemical species in the system."""
-        try:
-            return list(sorted(set([p.species for p in self.particle])))
-        except TypeError:
-            return list(sorted(set([int(p.species) for p in self.particle])))
+        from .particle import distinct_species
+        return distinct_species(self.particle)
 
     @property
     def density(self):
@@ -184,10 +182,9 @@ class System(object):
 
     def set_temperature(self, temperature):
         """Reset velocities to a Maxwellian distribution with fixed CM."""
-        from .particle import fix_total_momentum
+        from .particle import fix_total_momentum, maxwellian
         T = temperature
-        for p in self.particle:
-            p.maxwellian(T)
+        maxwellian(self.particle, T)
         fix_total_momentum(self.particle)
         # After fixing the CM the temperature is not exactly the targeted one
         # Therefore we scale the velocities so as to get to the right T
@@ -351,12 +348,9 @@ class System(object):
         """General center-of-mass attribute."""
         # It could be implemented in a more general and faster way via dumps
         # but one should pay attention to array ordering and views
-        x = numpy.zeros_like(getattr(self.particle[0], what))
-        mtot = 0.0
-        for p in self.particle:
-            x += getattr(p, what) * p.mass
-            mtot += p.mass
-        return x / mtot
+        x = numpy.array([getattr(p, what) for p in self.particle])
+        mass = numpy.array([p.mass for p in self.particle])
+        return numpy.dot(mass, x) / numpy.sum(mass)
 
     @property
     def cm_velocity(self):
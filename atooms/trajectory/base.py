@@ -295,6 +295,17 @@ class TrajectoryBase(object):
                 if current_step not in self.steps:
                     self.steps.append(current_step)
 
+    def write_many(self, systems_with_steps):
+        """
+        Write a sequence of `(system, step)` tuples.
+
+        The sequence can be a generator: frames are consumed and
+        written one at a time, so the whole trajectory need not fit in
+        memory.
+        """
+        for system, step in systems_with_steps:
+            self.write(system, step)
+
     def read_init(self):
         """
         Read metadata and/or set up data structures. Need not be
@@ -412,14 +423,18 @@ class TrajectoryBase(object):
         variables = list(self.variables)
         if only is not None:
             variables = only
+        # Keep a parallel set for O(1) membership tests
+        variables_set = set(variables)
         if include is not None:
             for pattern in canonicalize(include, self.thesaurus):
-                if pattern not in variables:
+                if pattern not in variables_set:
                     variables.append(pattern)
+                    variables_set.add(pattern)
         if exclude is not None:
             for pattern in canonicalize(exclude, self.thesaurus):
-                if pattern not in variables:
-                    variables.append(pattern)
+                if pattern in variables_set:
+                    variables.remove(pattern)
+                    variables_set.discard(pattern)
         conv.variables = variables
         conv.precision = self.precision
         conv.timestep = self.timestep
@@ -432,14 +447,31 @@ class TrajectoryBase(object):
         # In python 2, zipping t and t.steps will load everything
         # in RAM. In this case, it is better to use enumerate()
         if steps is None:
-            for i, system in progress(enumerate(self), total=len(self)):
-                conv.write(system, self.steps[i])
+            # Hoist the property lookup out of the loop
+            steps_list = self.steps
+            conv.write_many((system, steps_list[i]) for i, system
+                            in progress(enumerate(self), total=len(self)))
         else:
             # Only include requested steps (useful to prune
-            # non-periodic trajectories)
-            for step in steps:
-                idx = self.steps.index(step)
-                conv.write(self[idx], step)
+            # non-periodic trajectories). When the steps are sorted,
+            # a single vectorized searchsorted maps them all to frame
+            # indices; otherwise we build an explicit map, instead of
+            # a linear search per step.
+            import numpy
+            steps_arr = numpy.asarray(self.steps)
+            if numpy.all(steps_arr[1:] >= steps_arr[:-1]):
+                frames = numpy.searchsorted(steps_arr, steps)
+                if numpy.any(frames >= len(steps_arr)) or \
+                   not numpy.array_equal(steps_arr[frames], steps):
+                    raise ValueError('some requested steps are not in the trajectory')
+                frames = frames.tolist()
+            else:
+                frame_of_step = {step: frame for frame, step in enumerate(self.steps)}
+                try:
+                    frames = [frame_of_step[step] for step in steps]
+                except KeyError:
+                    raise ValueError('some requested steps are not in the trajectory')
+            conv.write_many((self[frame], step) for frame, step in zip(frames, steps))
         return conv
 
     @property
@@ -63,7 +63,14 @@ def _parse_mass(data, idx, system):
 
 def _parse_energy(data, idx, system):
     system.particle[idx].energy = float(data)
-    
+
+# Column-to-axis maps for the batched ATOMS parser
+_axis_pos = {'x': 0, 'y': 1, 'z': 2, 'xu': 0, 'yu': 1, 'zu': 2}
+_axis_pos_scaled = {'xs': 0, 'ys': 1, 'zs': 2, 'xsu': 0, 'ysu': 1, 'zsu': 2}
+_axis_vel = {'vx': 0, 'vy': 1, 'vz': 2}
+_axis_force = {'fx': 0, 'fy': 1, 'fz': 2}
+
+
 class TrajectoryLAMMPS(TrajectoryBase):
 
     """
@@ -98,6 +105,7 @@ class TrajectoryLAMMPS(TrajectoryBase):
         from collections import defaultdict
         self._file.seek(0)
         self._index_db = defaultdict(list)
+        self._steps_db = []
         while True:
             line = self._file.tell()
             data = self._file.readline()
@@ -112,6 +120,11 @@ class TrajectoryLAMMPS(TrajectoryBase):
                         entry = data[7+len(block):]
                         self._index_db[block].append((line, entry))
                         break
+                # Parse the step right away, during the indexing pass,
+                # which avoids seeking back to every TIMESTEP entry in
+                # a second pass over the file
+                if block == 'TIMESTEP':
+                    self._steps_db.append(int(self._file.readline()))
                 # Avoid reading after ATOOMS block has been found.
                 # We assume it is the last block in the file.
                 # The single_frame variable is a hint that there are
@@ -121,14 +134,7 @@ class TrajectoryLAMMPS(TrajectoryBase):
         self._file.seek(0)
 
     def read_steps(self):
-        steps = []
-        for idx, _ in self._index_db['TIMESTEP']:
-            self._file.seek(idx)
-            self._file.readline()
-            step = int(self._file.readline())
-            steps.append(step)
-        self._file.seek(0)
-        return steps
+        return list(self._steps_db)
 
     def read_system(self, frame):
         # Read number of particles
@@ -174,6 +180,17 @@ class TrajectoryLAMMPS(TrajectoryBase):
         else:
             interaction = None
 
+        # Fast path: parse the whole block in one pass. We fall back
+        # to the line-by-line parser when a particle subset is
+        # requested or when some field cannot be parsed as a float.
+        if self.first_particle < 0 and self.last_particle < 0:
+            block_start = self._file.tell()
+            try:
+                self._read_atoms_block(frame, npart, fields, system)
+                return system
+            except ValueError:
+                self._file.seek(block_start)
+
         for i in range(npart):
             # Limit reading the ATOMS section if requested
             if self.first_particle > 0 and i < self.first_particle:
@@ -196,6 +213,61 @@ class TrajectoryLAMMPS(TrajectoryBase):
 
         return system
 
+    def _read_atoms_block(self, frame, npart, fields, system):
+        """
+        Parse the whole ATOMS block at once via numpy and bulk-assign
+        the columns, instead of dispatching per-field callbacks on
+        every line.
+        """
+        # Read the block with a single call, using the offset of the
+        # next frame from the index, then tokenize and convert it in
+        # one pass. Any inconsistency raises ValueError, which makes
+        # the caller fall back to the line-by-line parser.
+        if frame + 1 < len(self._index_db['TIMESTEP']):
+            end = self._index_db['TIMESTEP'][frame + 1][0]
+            block = self._file.read(end - self._file.tell())
+        else:
+            block = self._file.read()
+        tokens = block.split()
+        if len(tokens) != npart * len(fields):
+            raise ValueError('unexpected number of entries in ATOMS block')
+        arr = numpy.array(tokens, dtype=numpy.float64).reshape(npart, len(fields))
+        col = {field: j for j, field in enumerate(fields)}
+
+        # Accept unsorted particles by sorting on their id
+        if 'id' in col:
+            arr = arr[numpy.argsort(arr[:, col['id']], kind='stable')]
+
+        # Positions and velocities, including scaled variants
+        side = system.cell.side
+        ndim = len(side)
+        pos = numpy.zeros((npart, ndim))
+        vel = numpy.zeros((npart, ndim))
+        for field, j in col.items():
+            if field in _axis_pos:
+                pos[:, _axis_pos[field]] = arr[:, j]
+            elif field in _axis_pos_scaled:
+                axis = _axis_pos_scaled[field]
+                pos[:, axis] = (arr[:, j] - 0.5) * side[axis]
+            elif field in _axis_vel:
+                vel[:, _axis_vel[field]] = arr[:, j]
+            elif field in _axis_force and system.interaction is not None:
+                system.interaction.forces[:, _axis_force[field]] = arr[:, j]
+        for i, p in enumerate(system.particle):
+            p.position = pos[i]
+            p.velocity = vel[i]
+
+        # Remaining per-particle attributes
+        if 'type' in col:
+            for p, species in zip(system.particle, arr[:, col['type']]):
+                p.species = str(int(species))
+        if 'mass' in col:
+            for p, mass in zip(system.particle, arr[:, col['mass']]):
+                p.mass = mass
+        if 'c_pe' in col:
+            for p, energy in zip(system.particle, arr[:, col['c_pe']]):
+                p.energy = energy
+
     def write_init(self, system):
         f = open(self.filename + '.inp', 'w')
         np = len(system.particle)
@@ -210,28 +282,35 @@ class TrajectoryLAMMPS(TrajectoryBase):
         h += "{:.{prec}f} {:.{prec}f} ylo yhi\n".format(-L[1]/2, L[1]/2, prec=self.precision)
         h += "{:.{prec}f} {:.{prec}f} zlo zhi\n".format(-L[2]/2, L[2]/2, prec=self.precision)
 
+        # Species-to-type map, built once to avoid a linear scan of
+        # the species list for every particle
+        species_idx = {species: isp + 1 for isp, species in enumerate(species_db)}
+
         # LAMMPS body
-        # Masses of species
+        # Masses of species, discovered in a single pass over the particles
+        masses = {}
+        for p in system.particle:
+            masses.setdefault(p.species, p.mass)
         m = "\nMasses\n\n"
-        for isp in range(len(species_db)):
-            # Iterate over particles. Find instances of species and get masses
-            for p in system.particle:
-                if p.species == species_db[isp]:
-                    m += '{:d} {:{prec}f}\n'.format(isp + 1, p.mass, prec=self.precision)
-                    break
+        for isp, species in enumerate(species_db):
+            m += '{:d} {:{prec}f}\n'.format(isp + 1, masses[species], prec=self.precision)
 
-        # Atom coordinates
-        r = "\nAtoms\n\n"
-        v = "\nVelocities\n\n"
-        for i, p in enumerate(system.particle):
-            isp = species_db.index(p.species) + 1
-            r += '{:d} {:d} {:{prec}} {:{prec}} {:{prec}}\n'.format(i+1, isp, *p.position, prec=self.precision)
-            v += '{:d}      {:{prec}} {:{prec}} {:{prec}}\n'.format(i+1, *p.velocity, prec=self.precision)
+        # Atom coordinates and velocities, stacked once and formatted
+        # in bulk instead of growing one string per particle
+        ids = numpy.arange(1, np + 1)
+        types = numpy.array([species_idx[p.species] for p in system.particle])
+        pos = numpy.array([p.position for p in system.particle])
+        vel = numpy.array([p.velocity for p in system.particle])
+        fmt = '%{prec}s'.format(prec=self.precision)
 
         f.write(h)
         f.write(m)
-        f.write(r)
-        f.write(v)
+        f.write("\nAtoms\n\n")
+        numpy.savetxt(f, numpy.column_stack([ids, types, pos]),
+                      fmt=['%d', '%d'] + [fmt] * pos.shape[1])
+        f.write("\nVelocities\n\n")
+        numpy.savetxt(f, numpy.column_stack([ids, vel]),
+                      fmt=['%d     '] + [fmt] * vel.shape[1])
         f.close()
 
     def write_system(self, system, step):
@@ -259,12 +338,10 @@ class TrajectoryFolderLAMMPS(TrajectoryFolder):
         # Small trick to force reading steps from lammps file
         self._steps = None
         # Sort frames according to step read in lammps file
-        sorted_steps = sorted(self.steps)
-        files_with_steps = [(x, y) for x, y in zip(self.files, self.steps)]
-        files_with_steps.sort(key=lambda x: sorted_steps.index(x[1]))
-        files = [_[0] for _ in files_with_steps]
-        self.files = files
-        self._steps = sorted_steps
+        steps = self.steps
+        order = numpy.argsort(steps, kind='stable')
+        self.files = [self.files[i] for i in order]
+        self._steps = [steps[i] for i in order]
 
     def read_steps(self):
         steps = []
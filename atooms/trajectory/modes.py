@@ -25,8 +25,12 @@ class TrajectoryModes(TrajectoryHDF5):
         parent = os.path.splitext(self._file.filename)[0]
         step = self.steps[frame]
         with TrajectoryHDF5(parent) as th:
-            # The step should be there
-            parent_frame = th.steps.index(step)
+            # The step should be there and steps are sorted, so we
+            # can locate it with a binary search
+            from bisect import bisect_left
+            parent_frame = bisect_left(th.steps, step)
+            if parent_frame >= len(th.steps) or th.steps[parent_frame] != step:
+                raise ValueError('step %s not found in %s' % (step, parent))
             system.particle = th[parent_frame].particle
             system.cell = th[parent_frame].cell
         return system
@@ -1,6 +1,7 @@
 """Store trajectory in memory (it can be huge)."""
 
 import copy
+from bisect import bisect_left
 from .base import TrajectoryBase
 
 
@@ -20,9 +21,14 @@ class TrajectoryRam(TrajectoryBase):
         self._overwrite = True
 
     def write_system(self, system, step):
-        if step in self.steps:
-            ind = self.steps.index(step)
+        # Steps are sorted in practice, so we first look for the
+        # frame with a binary search and only fall back to a linear
+        # one if they are not
+        ind = bisect_left(self.steps, step)
+        if ind < len(self.steps) and self.steps[ind] == step:
             self._system[ind].update(system)
+        elif step in self.steps:
+            self._system[self.steps.index(step)].update(system)
         else:
             self._system.append(copy.deepcopy(system))
             # Ensure the system cache is cleared
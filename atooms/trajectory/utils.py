@@ -1,7 +1,6 @@
 """Useful functions to manipulate trajectories."""
 
 import os
-import copy
 import tarfile
 import numpy
 import warnings
@@ -11,6 +10,12 @@ def gopen(filename, mode):
     ext = os.path.splitext(filename)[1]
     if ext == '.gz':
         import gzip
+        if mode.startswith('r'):
+            # Buffer between the decompressor and the consumer, which
+            # typically does many small readline() calls
+            import io
+            return io.TextIOWrapper(io.BufferedReader(gzip.open(filename, mode + 'b'),
+                                                      buffer_size=1024 * 1024))
         return gzip.open(filename, mode + 't')
     elif ext == '.bz2':
         import bz2
@@ -73,26 +78,54 @@ def split(inp, index='step', archive=False):
     Split the trajectory into independent trajectory files, one per
     sample.
     """
+    from concurrent.futures import ThreadPoolExecutor
+
     if archive:
+        import tempfile
         tar = tarfile.open(inp.filename + '.tar.gz', "w:gz")
+        # Write the per-sample files in a temporary directory, so
+        # that only the archive itself lands on the destination
+        # folder and we do not write every sample to it twice
+        tmpdir = tempfile.mkdtemp()
     base, ext = os.path.splitext(inp.filename)
 
-    for frame, step in enumerate(inp.steps):
-        system = inp[frame]
-        if index == 'step':
-            filename = '%s-%09i%s' % (base, step, ext)
-        elif index == 'frame' or index == 'sample':
-            filename = '%s-%09i%s' % (base, frame, ext)
-        else:
-            raise ValueError('unknown option %s' % index)
+    def _write_one(filename, system, step):
         with inp.__class__(filename, 'w') as t:
             t.write(system, step)
-        if archive:
-            tar.add(filename)
-            os.remove(filename)
 
+    # Writing the samples to independent files is I/O bound, so we
+    # push it through a small thread pool. Frames are still read
+    # sequentially, because the input trajectory is not thread-safe,
+    # and we keep a bounded number of them in flight.
+    written = []
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        pending = []
+        for frame, step in enumerate(inp.steps):
+            system = inp[frame]
+            if index == 'step':
+                filename = '%s-%09i%s' % (base, step, ext)
+            elif index == 'frame' or index == 'sample':
+                filename = '%s-%09i%s' % (base, frame, ext)
+            else:
+                raise ValueError('unknown option %s' % index)
+            if archive:
+                target = os.path.join(tmpdir, os.path.basename(filename))
+            else:
+                target = filename
+            written.append((target, filename))
+            pending.append(pool.submit(_write_one, target, system, step))
+            if len(pending) >= 16:
+                pending.pop(0).result()
+        for future in pending:
+            future.result()
+
+    # Archiving is serialized to preserve the tar ordering
     if archive:
+        for target, filename in written:
+            tar.add(target, arcname=filename)
+            os.remove(target)
         tar.close()
+        os.rmdir(tmpdir)
 
 
 def get_block_size(data):
@@ -103,34 +136,33 @@ def get_block_size(data):
     """
     if len(data) < 2:
         return 1
-    delta_old = 0
-    delta_one = data[1] - data[0]
-    iold = data[0]
-    period = 1
-    for ii in range(1, len(data)):
-        i = data[ii]
-        delta = i-iold
-        # If we find that we repeat the increment between entries is
-        # smaller than the previous iteration and it gets back to the
-        # initial one (delat_one) then we found a block. We must
-        # correct the +1 overshoot thus we subtract -1 to period
-        if delta < delta_old and delta == delta_one:
-            return period - 1
-        else:
-            period += 1
-            iold = i
-            delta_old = delta
+    # If we find that the increment between entries is smaller than
+    # the previous one and it gets back to the initial one (delta[0])
+    # then we found a block. We look for the first such entry with a
+    # single vectorized pass over the differences.
+    delta = numpy.diff(data)
+    # The block is usually much shorter than the trajectory, so we
+    # probe geometrically growing prefixes of the differences instead
+    # of scanning them all at once. At most, this doubles the work on
+    # non-periodic data.
+    size = len(delta)
+    n = min(64, size)
+    while True:
+        wrap = numpy.where((delta[1:n] < delta[:n-1]) & (delta[1:n] == delta[0]))[0]
+        if len(wrap) > 0:
+            return int(wrap[0]) + 1
+        if n >= size:
+            break
+        n = min(2 * n, size)
 
     # We got to the end of the trajectory
-    if len(data) != period:
-        raise ValueError('something went wrong in block analysis')
     if data[1]-data[0] == data[-1]-data[-2]:
         # If the difference between steps is constant (euristically)
         # the period is one
         return 1
     else:
         # There is no periodicity, the block size is the whole trajectory
-        return period
+        return len(data)
 
 
 def check_block_size(steps, block_size, prune=False):
@@ -158,30 +190,44 @@ def check_block_size(steps, block_size, prune=False):
     if block_size == len(steps):
         return None
 
-    steps_local = copy.copy(steps)
+    # We only copy the steps if we actually modify them, see below
+    steps_local = steps
 
-    # Identify steps that do not match the first periodic block
+    # Identify steps that do not match the first periodic block. We
+    # first compare the whole array to the expected periodic pattern
+    # in a single vectorized check and only fall back to the greedy
+    # pruning loop if some step does not conform.
     block = steps_local[0: block_size]
-    ibl, jbl = 0, 0
-    prune_me = []
-    for _, step in enumerate(steps_local):
-        offset = block[0] if ibl > 0 else 0
-        step_expected = ibl * (steps_local[block_size] - offset) + block[jbl]
-        if step == step_expected:
-            if jbl == block_size-1:
-                # We are done with this block, we start over
-                ibl += 1
-                jbl = 0
+    idx = numpy.arange(len(steps_local))
+    stride = steps_local[block_size] - block[0]
+    expected = (idx // block_size) * stride + numpy.asarray(block)[idx % block_size]
+    if numpy.array_equal(steps_local, expected):
+        prune_idx = []
+    else:
+        # The expected step is maintained incrementally: we advance
+        # the index within the block and add the block stride at wraps
+        base, jbl = 0, 0
+        prune_idx = []
+        for i, step in enumerate(steps_local):
+            if step == base + block[jbl]:
+                if jbl == block_size-1:
+                    # We are done with this block, we start over
+                    base += stride
+                    jbl = 0
+                else:
+                    # We increment the index within the block
+                    jbl += 1
             else:
-                # We increment the index within the block
-                jbl += 1
-        else:
-            prune_me.append(step)
+                prune_idx.append(i)
 
-    # Remove samples that do not conform with first block
-    if prune and len(prune_me) > 0:
-        for step in prune_me:
-            _ = steps_local.pop(steps_local.index(step))
+    # Remove samples that do not conform with first block. We prune
+    # by position, not by value, so duplicate steps elsewhere in the
+    # list are preserved. This builds a new list, leaving the input
+    # steps untouched.
+    if prune and len(prune_idx) > 0:
+        prune_set = set(prune_idx)
+        steps_local = [step for i, step in enumerate(steps_local)
+                       if i not in prune_set]
 
     # Check if the number of steps is an integer multiple of
     # block period (we tolerate a rest of 1)
@@ -191,37 +237,46 @@ def check_block_size(steps, block_size, prune=False):
         warnings.warn('truncated block')
 
     # Final test, after pruning spurious samples we should have a period
-    # sampling, otherwise there was some error
+    # sampling, otherwise there was some error. We test that the
+    # difference between the finger print and the first sample in each
+    # block is constant, via a single vectorized comparison.
     nbl = len(steps_local) // block_size
-    for i in range(nbl):
-        # We test that the difference between the finger print and the
-        # first sample in the block is constant
-        diff_last = None
-        for j in range(len(block)):
-            diff = steps_local[i*block_size + j] - block[j]
-            if diff_last is None:
-                diff_last = diff
-            if diff_last != diff:
-                raise IndexError('block does not match finger print {}'.format(block))
+    diff = numpy.asarray(steps_local[: nbl * block_size]).reshape(nbl, block_size) - \
+        numpy.asarray(block)
+    if not numpy.all(diff == diff[:, 0:1]):
+        raise IndexError('block does not match finger print {}'.format(block))
     return steps_local
 
 
-def dump(trajectory, what='pos'):
+def dump(trajectory, what='pos', dtype=numpy.float64, layout='aos'):
     """
     Dump coordinates as a list of (npart, ndim) numpy arrays if the
-    trajectory is grandcanonical or as (nsteps, npart, ndim) numpy
-    array if it is not grandcanonical.
+    trajectory is grandcanonical or as a (nsteps, npart, ndim) numpy
+    array of the requested `dtype` if it is not grandcanonical.
+
+    With `layout='soa'` the canonical array is transposed to
+    (ndim, nsteps, npart), so that reads along each coordinate axis
+    are contiguous for vectorized analysis. Use `dtype=numpy.float32`
+    to halve the memory when single precision is enough.
     """
     if trajectory.grandcanonical:
-        data = []
-        for i, s in enumerate(trajectory):
-            data[i].append(s.dump(what))
-    else:
-        data = numpy.zeros([len(trajectory.steps),
-                            len(trajectory[0].particle),
-                            len(trajectory[0].cell.side)])
+        data = [s.dump(what) for s in trajectory]
+        return data
+
+    first = trajectory[0]
+    nsteps = len(trajectory.steps)
+    npart = len(first.particle)
+    ndim = len(first.cell.side)
+    if layout == 'aos':
+        data = numpy.empty([nsteps, npart, ndim], dtype=dtype)
         for i, s in enumerate(trajectory):
             data[i] = s.dump(what)
+    elif layout == 'soa':
+        data = numpy.empty([ndim, nsteps, npart], dtype=dtype)
+        for i, s in enumerate(trajectory):
+            data[:, i, :] = s.dump(what).transpose()
+    else:
+        raise ValueError('unknown layout %s' % layout)
 
     return data
 
@@ -239,10 +294,13 @@ def field(trajectory, trajectory_field, field_name, frame, x_field=None):
         index_field = trajectory_field.steps.index(step)
     except ValueError:
         return None
-    x = []
-    for pi in trajectory_field[index_field].particle:
-        fi = getattr(pi, field_name)
-        x.append(fi)
+    # Collect the attributes in one pass and return them as a numpy
+    # array, ready for vectorized consumers. attrgetter resolves the
+    # attribute name once, instead of on every particle.
+    from operator import attrgetter
+    getter = attrgetter(field_name)
+    x = numpy.array([getter(pi)
+                     for pi in trajectory_field[index_field].particle])
     return x
 
 
@@ -258,13 +316,32 @@ def paste(t1, t2):
     for s1, s2 in paste(t1, t2):
         pass
     """
-    steps_1 = set(t1.steps)
-    steps_2 = set(t2.steps)
-    steps = sorted(steps_1 & steps_2)
-    for step in steps:
-        s1 = t1[t1.steps.index(step)]
-        s2 = t2[t2.steps.index(step)]
-        yield step, s1, s2
+    steps_1 = t1.steps
+    steps_2 = t2.steps
+
+    def _sorted(steps):
+        return all(steps[i] <= steps[i+1] for i in range(len(steps)-1))
+
+    if _sorted(steps_1) and _sorted(steps_2):
+        # Steps are sorted (the common case): walk the two lists with
+        # a single merge pass, skipping unmatched steps
+        i, j = 0, 0
+        while i < len(steps_1) and j < len(steps_2):
+            if steps_1[i] == steps_2[j]:
+                yield steps_1[i], t1[i], t2[j]
+                i += 1
+                j += 1
+            elif steps_1[i] < steps_2[j]:
+                i += 1
+            else:
+                j += 1
+    else:
+        # Fall back to explicit step-to-frame maps
+        steps = sorted(set(steps_1) & set(steps_2))
+        frames_1 = {step: frame for frame, step in enumerate(steps_1)}
+        frames_2 = {step: frame for frame, step in enumerate(steps_2)}
+        for step in steps:
+            yield step, t1[frames_1[step]], t2[frames_2[step]]
 
 
 def is_cell_variable(trajectory, tests=1):
@@ -387,11 +464,14 @@ def info(trajectory, keys=None):
     if keys is None:
 
         # Default: full info
+        # Hoist frames, steps and block size, whose getters may
+        # re-scan the trajectory on every access
+        n_frames = len(trajectory)
         txt = ''
         txt += 'path                 = %s\n' % trajectory.filename
         txt += 'format               = %s\n' % trajectory.__class__
-        txt += 'frames               = %s\n' % len(trajectory)
-        txt += 'megabytes            = %s\n' % (os.path.getsize(trajectory.filename) / 1e6)
+        txt += 'frames               = %s\n' % n_frames
+        txt += 'megabytes            = %s\n' % (os.stat(trajectory.filename).st_size / 1e6)
         txt += 'particles            = %s\n' % len(system.particle)
         txt += 'species              = %s\n' % ', '.join(distinct_species(system.particle))
         txt += 'composition          = %s\n' % dict(composition(system.particle))
@@ -400,25 +480,29 @@ def info(trajectory, keys=None):
         if system.cell is not None:
             txt += 'cell side            = %s\n' % str(list(system.cell.side))[1: -1]
             txt += 'cell volume          = %s\n' % system.cell.volume
-        if len(trajectory) > 1:
-            txt += 'steps                = %s\n' % trajectory.steps[-1]
-            txt += 'duration             = %s\n' % trajectory.times[-1]
+        if n_frames > 1:
+            steps = trajectory.steps
+            times = trajectory.times
+            block_size = trajectory.block_size
+            txt += 'steps                = %s\n' % steps[-1]
+            txt += 'duration             = %s\n' % times[-1]
             txt += 'timestep             = %s\n' % trajectory.timestep
-            txt += 'block size           = %s\n' % trajectory.block_size
-            if trajectory.block_size == 1:
-                txt += 'steps between frames = %s\n' % (trajectory.steps[1]-trajectory.steps[0])
-                txt += 'time between frames  = %s\n' % (trajectory.times[1]-trajectory.times[0])
+            txt += 'block size           = %s\n' % block_size
+            if block_size == 1:
+                txt += 'steps between frames = %s\n' % (steps[1]-steps[0])
+                txt += 'time between frames  = %s\n' % (times[1]-times[0])
             else:
-                txt += 'block steps          = %s\n' % trajectory.steps[trajectory.block_size-1]
-                txt += 'block                = %s\n' % ([trajectory.steps[i] for i in range(trajectory.block_size)])
+                txt += 'block steps          = %s\n' % steps[block_size-1]
+                txt += 'block                = %s\n' % (steps[0: block_size])
             txt += 'grandcanonical       = %s' % trajectory.grandcanonical
         return txt
 
     else:
         # Selected infos.
         # TODO: of course, it would be cleaner to have a little class for that
+        keys_list = keys.split(',')
         outs = []
-        for key in keys.split(','):
+        for key in keys_list:
             if key == 'path':
                 outs.append(trajectory.filename)
             elif key == 'format':
@@ -426,7 +510,7 @@ def info(trajectory, keys=None):
             elif key == 'frames':
                 outs.append(len(trajectory))
             elif key == 'megabytes':
-                outs.append(os.path.getsize(trajectory.filename) / 1e6)
+                outs.append(os.stat(trajectory.filename).st_size / 1e6)
             elif key == 'particles':
                 outs.append(len(system.particle))
             elif key == 'species':
@@ -459,8 +543,8 @@ def info(trajectory, keys=None):
                 outs.append(trajectory.grandcanonical)
 
         txt = ''
-        fmt = '%%-%ds : %%s\n' % (max([len(key) for key in keys.split(',')]))
-        for key, out in zip(keys.split(','), outs):
+        fmt = '%%-%ds : %%s\n' % (max([len(key) for key in keys_list]))
+        for key, out in zip(keys_list, outs):
             txt += fmt % (key, out)
 
         return txt.strip('\n')
@@ -117,6 +117,23 @@ class Test(unittest.TestCase):
         self.assertTrue(ov)
         self.assertEqual(ipart, [(0, 1)])
 
+    def test_overlap_pairs_cell_list(self):
+        # Above _CELL_LIST_MIN_NPART overlap_pairs() dispatches to the
+        # cell list: pin it against the all-pairs kernel
+        from atooms.system._kernels import overlap_pairs, _overlap_pairs_numpy, \
+            _CELL_LIST_MIN_NPART
+        numpy.random.seed(1)
+        for ndim, side in [(3, 6.0), (2, 5.0)]:
+            npart = _CELL_LIST_MIN_NPART + 50
+            box = numpy.array([side] * ndim)
+            # Include positions outside the box to exercise the folding
+            pos = numpy.random.uniform(-side, side, (npart, ndim))
+            radii = numpy.random.uniform(0.05, 0.15, npart)
+            pairs = overlap_pairs(pos, radii, box)
+            pairs_ref = sorted(_overlap_pairs_numpy(pos, radii, box))
+            self.assertTrue(len(pairs) > 0)
+            self.assertEqual(pairs, pairs_ref)
+
     def test_dump(self):
         self.assertEqual(self.ref.dump('spe')[-1],
                          self.ref.dump('particle.species')[-1])
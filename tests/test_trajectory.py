@@ -435,6 +435,32 @@ B 2.9 -2.9 0.0
         with trj.TrajectoryXYZ(self.inpfile, 'r') as th:
             self._copy_inplace(th)
 
+    def test_copy_exclude(self):
+        fout = self.inpfile + '.out'
+        with trj.TrajectoryXYZ(self.inpfile, 'w') as th:
+            th.variables = ['species', 'position', 'velocity']
+            th.write(self.system[0], 0)
+        with trj.TrajectoryXYZ(self.inpfile, 'r') as th:
+            th.copy(fout=fout, exclude=['vel']).close()
+        with trj.TrajectoryXYZ(fout, 'r') as th:
+            self.assertNotIn('particle.velocity', th.variables)
+            self.assertIn('particle.position', th.variables)
+        rmf(fout)
+
+    def test_dump_grandcanonical(self):
+        from atooms.trajectory.utils import dump
+        with trj.TrajectoryXYZ(self.inpfile, 'w') as th:
+            th.write(self.system[0], 0)
+            system = self.system[1]
+            system.particle = system.particle[0: 1]
+            th.write(system, 1)
+        with trj.TrajectoryXYZ(self.inpfile, 'r') as th:
+            th._grandcanonical = True
+            data = dump(th)
+            self.assertEqual(len(data), 2)
+            self.assertEqual(data[0].shape, (2, 3))
+            self.assertEqual(data[1].shape, (1, 3))
+
     def test_info(self):
         with trj.xyz.TrajectoryXYZ(self.inpfile, 'w') as th:
             th.write(self.system[0])